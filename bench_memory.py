@@ -0,0 +1,106 @@
+"""
+Memory benchmark for the bounded-memory scraper.
+
+Serves synthetic huge pages from a local HTTP server (generated on the fly,
+never held in memory), runs them through ingest.get_content with the memory
+profiler on, and fails if peak RSS goes over the budget.
+
+    python3 bench_memory.py                      # 10 pages x 50MB, budget from config
+    python3 bench_memory.py --pages 20 --page-mb 200 --budget-mb 400
+
+Even-numbered pages come back from the fake Jina reader (plain text); odd
+ones 404 there and fall through to the trafilatura HTML path.
+"""
+import sys
+import argparse
+import threading
+import config
+import memprof
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHUNK = 64 * 1024
+PARAGRAPH = ("<p>The council voted on the downtown budget after a long debate about "
+             "transit, housing and road repair funding for the coming fiscal year.</p>\n")
+
+def generate(size, html):
+    """Yields `size` bytes of synthetic page content in CHUNK-sized pieces."""
+    head = b"<html><head><title>Huge page</title></head><body><article>\n" if html else b""
+    line = PARAGRAPH.encode() if html else PARAGRAPH[3:-5].encode() + b"\n"
+    body = line * (CHUNK // len(line) + 1)
+
+    sent = 0
+    if head:
+        yield head
+        sent += len(head)
+    while sent < size:
+        piece = body[:min(CHUNK, size - sent)]
+        yield piece
+        sent += len(piece)
+
+class HugePageHandler(BaseHTTPRequestHandler):
+    page_bytes = 50 * 1024 * 1024
+
+    def do_GET(self):
+        # /reader/<url> mimics r.jina.ai, /page/<n> is the raw article
+        is_reader = self.path.startswith("/reader/")
+        page_no = int(self.path.rstrip("/").rsplit("/", 1)[-1])
+        if is_reader and page_no % 2:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8" if is_reader else "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(self.page_bytes))
+        self.end_headers()
+        try:
+            for piece in generate(self.page_bytes, html=not is_reader):
+                self.wfile.write(piece)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client stopped reading at its cap, which is the point
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--page-mb", type=int, default=50)
+    parser.add_argument("--budget-mb", type=float, default=config.MEMORY_BUDGET_MB)
+    args = parser.parse_args()
+
+    HugePageHandler.page_bytes = args.page_mb * 1024 * 1024
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HugePageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    config.JINA_READER_URL = f"{base}/reader/"
+
+    import ingest  # After the config override; pulls in requests/trafilatura/lxml
+
+    profiler = memprof.MemoryProfiler()
+    profiler.start()
+    start_rss = memprof.rss_mb()
+
+    print(f"{args.pages} pages x {args.page_mb} MB, cap {config.MAX_DOWNLOAD_BYTES // 1024} KB "
+          f"download / {config.MAX_EXTRACT_CHARS} chars extract, budget {args.budget_mb:.0f} MB")
+    print(f"RSS after imports: {start_rss:.0f} MB")
+
+    for i in range(args.pages):
+        with profiler.stage("fetch"):
+            text = ingest.get_content(f"{base}/page/{i}", "")
+        with profiler.stage("prompt"):
+            prompt = text[:config.PROMPT_CHARS]
+        print(f"  page {i}: {len(text)} chars extracted, {len(prompt)} in prompt, RSS {memprof.rss_mb():.0f} MB")
+
+    profiler.stop()
+    server.shutdown()
+
+    for stage, s in profiler.stages.items():
+        print(f"{stage:>8}: peak RSS {s['rss_peak_mb']:.0f} MB, Python heap {s['py_peak_mb']:.1f} MB")
+
+    peak = max(profiler.peak_rss_mb(), memprof.max_rss_mb())
+    verdict = "OK" if peak <= args.budget_mb else "OVER BUDGET"
+    print(f"Peak RSS {peak:.0f} MB / budget {args.budget_mb:.0f} MB -> {verdict}")
+    return 0 if peak <= args.budget_mb else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Dashboard startup benchmark.
+
+Each measurement runs in a fresh interpreter so nothing is pre-imported:
+  1. Import time of the dashboard's own modules (config + feed), checked
+     against DASHBOARD_IMPORT_BUDGET_MS, and which heavy modules they pull in.
+  2. Cold first render: new process -> import streamlit -> run app.py once
+     (streamlit's AppTest, no browser).
+  3. Warm first render: a second, fresh AppTest run of app.py in that same
+     process (imports and the OS file cache are warm).
+
+    python3 bench_startup.py            # 3 rounds
+    python3 bench_startup.py --rounds 5
+
+Exits non-zero if the import budget is exceeded or a forbidden module
+(pandas, dotenv) is imported by the dashboard's read path.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules the dashboard's read path must not import
+FORBIDDEN = ("pandas", "dotenv")
+
+IMPORT_PROBE = """
+import sys, json, time
+t = time.perf_counter()
+import config, feed
+ms = (time.perf_counter() - t) * 1000
+print(json.dumps({"import_ms": ms, "budget_ms": config.DASHBOARD_IMPORT_BUDGET_MS,
+                  "loaded": [m for m in %r if m in sys.modules]}))
+""" % (FORBIDDEN,)
+
+RENDER_PROBE = """
+import json, time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+import_ms = (time.perf_counter() - t) * 1000
+
+def render():
+    t = time.perf_counter()
+    at = AppTest.from_file("app.py", default_timeout=60)
+    at.run()
+    if at.exception:
+        raise SystemExit(f"app.py raised: {at.exception[0].value}")
+    return (time.perf_counter() - t) * 1000
+
+cold_ms = render()
+warm_ms = render()
+print(json.dumps({"streamlit_import_ms": import_ms, "cold_ms": import_ms + cold_ms, "warm_ms": warm_ms}))
+"""
+
+def probe(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(out.stderr.strip() or out.stdout.strip())
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    imports = [probe(IMPORT_PROBE) for _ in range(args.rounds)]
+    renders = [probe(RENDER_PROBE) for _ in range(args.rounds)]
+
+    import_ms = statistics.median(r["import_ms"] for r in imports)
+    budget_ms = imports[0]["budget_ms"]
+    loaded = sorted({m for r in imports for m in r["loaded"]})
+
+    print(f"config + feed import: {import_ms:.1f} ms (budget {budget_ms} ms)")
+    print(f"forbidden modules imported: {', '.join(loaded) or 'none'}")
+    print(f"streamlit import:     {statistics.median(r['streamlit_import_ms'] for r in renders):.0f} ms")
+    print(f"cold first render:    {statistics.median(r['cold_ms'] for r in renders):.0f} ms (fresh process, incl. streamlit import)")
+    print(f"warm first render:    {statistics.median(r['warm_ms'] for r in renders):.0f} ms (new session, warm process)")
+    print(f"median of {args.rounds} rounds")
+
+    ok = import_ms <= budget_ms and not loaded
+    print("OK" if ok else "OVER BUDGET")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
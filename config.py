@@ -1,33 +1,91 @@
 import os
-from dotenv import load_dotenv
-
-# Load secrets
-load_dotenv()
-
-# Secrets
-TAILSCALE_IP = os.getenv("TAILSCALE_IP")
-PUSHOVER_USER_KEY = os.getenv("PUSHOVER_USER_KEY")
-PUSHOVER_API_TOKEN = os.getenv("PUSHOVER_API_TOKEN")
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
-
-# Validate required secrets
-required_secrets = {
-    "PUSHOVER_USER_KEY": PUSHOVER_USER_KEY,
-    "PUSHOVER_API_TOKEN": PUSHOVER_API_TOKEN,
-    "TAVILY_API_KEY": TAVILY_API_KEY
+
+# Secrets are loaded lazily (module __getattr__) on first access, as the value
+# or None. The dashboard never touches them, so it starts without python-dotenv
+# or a complete .env; ingest/notify call require() to fail fast on the ones they use.
+SECRET_SECTIONS = {
+    "ingest": ("TAVILY_API_KEY",),
+    "notify": ("PUSHOVER_USER_KEY", "PUSHOVER_API_TOKEN"),
 }
+OPTIONAL_SECRETS = ("TAILSCALE_IP",)
+
+_env_loaded = False
+
+def _load_env():
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+def require(section):
+    """Loads .env and validates the secrets one part of the app needs."""
+    _load_env()
+    missing = [k for k in SECRET_SECTIONS[section] if not os.getenv(k)]
+    if missing:
+        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
-missing = [k for k, v in required_secrets.items() if not v]
-if missing:
-    raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+def __getattr__(name):
+    # Only called for names not defined below, i.e. the secrets.
+    # Never raises for a known secret, so hasattr()/getattr(..., default) keep working.
+    secrets = OPTIONAL_SECRETS + tuple(n for names in SECRET_SECTIONS.values() for n in names)
+    if name not in secrets:
+        raise AttributeError(f"module 'config' has no attribute '{name}'")
+    _load_env()
+
+    value = os.getenv(name)
+    globals()[name] = value
+    return value
 
 # Database
 DB_NAME = "news.db"
 
+# Static Snapshots (pre-rendered briefings served without Streamlit)
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_PORT = 8502
+SNAPSHOT_KEEP_DAYS = 7
+
+# Bounded memory (Ollama holds most of the Jetson's 8GB of shared memory)
+JINA_READER_URL = "https://r.jina.ai/"
+MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024   # Stop reading a page after 2MB (streamed)
+MAX_EXTRACT_CHARS = 8000               # Extracted text kept per article
+PROMPT_CHARS = 4000                    # Article text sent to the model (~1000 tokens)
+MEMORY_PROFILE = False                 # Log per-stage peak RSS / Python heap to ingest.log
+MEMORY_BUDGET_MB = 512                 # Peak RSS budget (warned in ingest, enforced by bench_memory.py)
+
+# Dashboard startup: import-time budget for the dashboard's own modules (bench_startup.py)
+DASHBOARD_IMPORT_BUDGET_MS = 100
+
 # The "Brain" Settings
 OLLAMA_URL = "http://localhost:11434/api/generate"
 OLLAMA_MODEL = "qwen2.5:7b"  # Best balance: powerful reasoning + fits Jetson 8GB RAM
 
+# Structured output: send a JSON schema as Ollama's `format` instead of parsing free text
+STRUCTURED_OUTPUT = True
+MAX_REPAIR_ATTEMPTS = 1  # Re-ask only for the fields that failed validation
+IMPACT_RETRY_DAYS = 3    # Articles this recent get missing/failed persona scores retried
+
+# Max tokens generated per task (the JSON answers are small)
+NUM_PREDICT = {
+    "summary": 320,
+    "impact": 128,
+    "delta": 200,
+    "repair": 128,
+    "text": 600   # Legacy free-text mode (STRUCTURED_OUTPUT = False)
+}
+
+# News search (Tavily): all topics are searched concurrently at the start of a run
+SEARCH_MAX_RESULTS = 3
+SEARCH_WORKERS = 4
+SEARCH_CACHE_TTL = 6 * 60 * 60  # Seconds; reruns inside this window make no API calls
+
+# Story threading: follow-ups to a recent story only get a "what changed" analysis
+THREAD_LOOKBACK_DAYS = 3    # How far back to look for a matching thread
+THREAD_SIMILARITY = 0.35    # Min similarity (0-1) to count as a follow-up
+THREAD_TOPIC_WEIGHT = 0.2   # Share of the similarity that comes from search-topic overlap
+THREAD_MIN_TEXT_SIMILARITY = 0.27  # Text similarity needed before topic overlap counts at all
+THREAD_MAX_UPDATES = 6      # Dated update bullets kept in a thread's story so far (oldest dropped)
+
 # What you want the agent to search for every morning
 
 SEARCH_TOPICS = [
@@ -15,10 +15,18 @@ fi
 echo "🚀 Starting Daily Ingestion..."
 python3 ingest.py
 
-# 3. Send Notification (The Result)
+# 3. Self-Healing: Ensure Snapshot Server is Up (before notify, which links to it)
+if ! systemctl is-active --quiet jetson-snapshots.service; then
+    echo "🔄 Snapshot server down. Restarting via systemd..."
+    sudo systemctl restart jetson-snapshots.service
+else
+    echo "✅ Snapshot server is running."
+fi
+
+# 4. Send Notification (The Result)
 python3 notify.py
 
-# 4. Self-Healing: Ensure Dashboard is Up (via systemd)
+# 5. Self-Healing: Ensure Dashboard is Up (via systemd)
 if ! systemctl is-active --quiet jetson-briefing.service; then
     echo "🔄 Dashboard service down. Restarting via systemd..."
     sudo systemctl restart jetson-briefing.service
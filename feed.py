@@ -0,0 +1,300 @@
+import sqlite3
+import datetime
+import config
+import stories
+import json
+import re
+import html
+from urllib.parse import urlparse
+
+# -----------------------------------------------------------------------------
+# Shared feed logic for the Streamlit dashboard and the static snapshots.
+# Nothing in here imports streamlit, so ingest can render pages too.
+# -----------------------------------------------------------------------------
+
+# Custom CSS for "Expert Level" UI
+CARD_CSS = """
+<style>
+    /* Import Inter font for a clean, modern look */
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
+    
+    html, body, [class*="css"] {
+        font-family: 'Inter', sans-serif;
+        background-color: #0E1117; /* Deep dark background */
+    }
+
+    /* Hide Streamlit Default Chrome */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+    
+    /* ---------------------------------------------------------------------
+       CARD COMPONENT (Inside Expander)
+       --------------------------------------------------------------------- */
+    .news-card-content {
+        background-color: #1C1F26;
+        border-radius: 8px;
+        padding: 20px;
+        margin-top: 0px;
+        border: 1px solid #2E333D;
+    }
+
+    /* IMPACT BADGES */
+    .badge {
+        display: inline-flex;
+        align-items: center;
+        padding: 4px 12px;
+        border-radius: 100px;
+        font-size: 0.75rem;
+        font-weight: 700;
+        text-transform: uppercase;
+        letter-spacing: 0.05em;
+        margin-right: 8px;
+        margin-bottom: 12px;
+    }
+    
+    .badge-critical { background-color: rgba(255, 75, 75, 0.15); color: #FF4B4B; border: 1px solid rgba(255, 75, 75, 0.3); }
+    .badge-high { background-color: rgba(255, 165, 0, 0.15); color: #FFA500; border: 1px solid rgba(255, 165, 0, 0.3); }
+    .badge-low { background-color: rgba(255, 255, 255, 0.05); color: #888; border: 1px solid rgba(255, 255, 255, 0.1); }
+    
+    .topic-tag {
+        display: inline-flex;
+        align-items: center;
+        padding: 2px 8px;
+        border-radius: 4px;
+        font-size: 0.7rem;
+        background-color: #262A35;
+        color: #A0A0A0;
+        border: 1px solid #3E4451;
+        margin-right: 6px;
+    }
+
+    /* TYPOGRAPHY */
+    .card-summary {
+        font-size: 0.95rem;
+        color: #C0C0C0;
+        line-height: 1.6;
+        margin-bottom: 20px;
+    }
+    
+    .card-summary ul {
+        padding-left: 20px;
+        margin: 0;
+    }
+    
+    .card-summary li {
+        margin-bottom: 8px;
+    }
+    
+    .source-link {
+        font-size: 0.85rem;
+        color: #4DA6FF;
+        text-decoration: none;
+        display: inline-block;
+        margin-top: 10px;
+    }
+    
+    .source-link:hover {
+        text-decoration: underline;
+    }
+
+    /* AI ANALYSIS BOX */
+    .analysis-box {
+        background-color: #262A35;
+        border-left: 3px solid #4DA6FF;
+        padding: 12px 16px;
+        border-radius: 0 8px 8px 0;
+        margin-top: 16px;
+    }
+    
+    .analysis-header {
+        font-size: 0.7rem;
+        text-transform: uppercase;
+        color: #4DA6FF;
+        font-weight: 700;
+        margin-bottom: 4px;
+        display: flex;
+        align-items: center;
+        gap: 6px;
+    }
+    
+    .analysis-content {
+        font-size: 0.9rem;
+        color: #E0E0E0;
+        font-style: italic;
+    }
+
+</style>
+"""
+
+FEED_COLUMNS = """
+    a.id, a.title, a.link, a.summary, a.topics, a.date,
+    i.impact_score, i.impact_reason
+"""
+
+# Story thread info (databases created before threading lack these columns)
+THREAD_COLUMNS = """,
+    a.thread_id, a.is_update, t.title AS thread_title,
+    t.first_date AS thread_since, t.article_count AS thread_count,
+    t.summary AS thread_summary
+"""
+
+def _select(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+    if "thread_id" in columns:
+        return f"""
+            SELECT {FEED_COLUMNS}{THREAD_COLUMNS}
+            FROM articles a
+            JOIN article_impacts i ON a.link = i.article_link
+            LEFT JOIN story_threads t ON a.thread_id = t.id
+        """
+    return f"""
+        SELECT {FEED_COLUMNS}
+        FROM articles a
+        JOIN article_impacts i ON a.link = i.article_link
+    """
+
+def load_feed(persona_name, today=None):
+    """
+    Returns today's relevant articles for a persona as a list of dicts,
+    one card per story thread (the newest article, showing its delta).
+    """
+    conn = sqlite3.connect(config.DB_NAME)
+    conn.row_factory = sqlite3.Row
+    today = today or datetime.date.today().isoformat()
+
+    try:
+        select = _select(conn)
+    except sqlite3.Error:
+        conn.close()
+        return []
+
+    # Join articles with impacts for the specific persona
+    # ADDED FILTER: impact_score > 1 to hide noise
+    query = select + """
+        WHERE i.persona = ? 
+        AND a.date = ?
+        AND i.impact_score > 1
+        ORDER BY i.impact_score DESC
+    """
+
+    try:
+        rows = conn.execute(query, (persona_name, today)).fetchall()
+    except sqlite3.Error:
+        rows = []
+
+    # Fallback: If no news today, show latest 10 items for this persona
+    if not rows:
+        query = select + """
+            WHERE i.persona = ?
+            AND i.impact_score > 1
+            ORDER BY a.date DESC, i.impact_score DESC LIMIT 10
+        """
+        try:
+            rows = conn.execute(query, (persona_name,)).fetchall()
+        except sqlite3.Error:
+            pass
+
+    conn.close()
+    return stories.group_threads([dict(r) for r in rows])
+
+def summary_to_html(summary):
+    """Summary text (bullets or a paragraph) as escaped HTML."""
+    summary_text = str(summary)
+    
+    # If summary looks like HTML (from RSS fallback), strip tags first
+    if "<" in summary_text and ">" in summary_text:
+        summary_text = re.sub('<[^<]+?>', '', summary_text)
+    
+    # Check for bullet points BEFORE escaping
+    has_bullets = ("-" in summary_text or "•" in summary_text or "\n" in summary_text)
+    
+    if has_bullets:
+        # Process line by line, escape each item
+        items = []
+        for line in summary_text.split('\n'):
+            # Clean generic bullet chars
+            line = line.strip().replace("- ", "").replace("* ", "").replace("• ", "")
+            if line:
+                items.append(html.escape(line))
+        summary_html = "<ul>" + "".join([f"<li>{item}</li>" for item in items]) + "</ul>"
+    else:
+        # Single paragraph - escape and wrap
+        summary_html = f"<p>{html.escape(summary_text)}</p>"
+
+    return summary_html
+
+def render_content_html(row):
+    """Generates the HTML content INSIDE the expander."""
+    score = row['impact_score']
+    
+    # Badge Logic
+    if score >= 8:
+        badge_html = f'<span class="badge badge-critical">Critical • {score}/10</span>'
+    elif score >= 5:
+        badge_html = f'<span class="badge badge-high">Important • {score}/10</span>'
+    else:
+        badge_html = f'<span class="badge badge-low">Info • {score}/10</span>'
+
+    # Topics Logic (Handle missing column or JSON errors)
+    topics_html = ""
+    if 'topics' in row and row['topics']:
+        try:
+            topics_list = json.loads(row['topics'])
+            if isinstance(topics_list, list):
+                for topic in topics_list:
+                    topics_html += f'<span class="topic-tag">{html.escape(str(topic))}</span>'
+        except:
+            pass
+
+    # Story thread tags: follow-ups show only what changed since the last article
+    thread_html = ""
+    if row.get('is_update'):
+        thread_html += f'<span class="topic-tag">🧵 Update · following since {row.get("thread_since")}</span>'
+    if row.get('folded'):
+        thread_html += f'<span class="topic-tag">+{row["folded"]} related</span>'
+
+    # Summary Formatting
+    summary_html = summary_to_html(row['summary'])
+    
+    # Follow-ups: the delta alone lacks context, so lead with the story so far
+    summary_label = ""
+    if row.get('is_update'):
+        story = stories.story_before(row.get('thread_summary'), row['summary'], row['date'])
+        if story:
+            summary_label += "<b>Story so far:</b>" + summary_to_html(story)
+        summary_label += "<b>What changed:</b>"
+
+    # Escape the impact reason
+    impact_reason_escaped = html.escape(str(row['impact_reason']))
+    
+    # Source link: only real web links (these pages are served standalone, not behind Streamlit)
+    link = str(row['link'])
+    if urlparse(link).scheme in ("http", "https"):
+        link_html = f'<a href="{html.escape(link, quote=True)}" target="_blank" rel="noopener noreferrer" class="source-link">🔗 Read Original Source</a>'
+    else:
+        link_html = '<span class="source-link">🔗 Source unavailable</span>'
+
+    # Date (simple text, no HTML needed)
+    date_str = row.get('date', 'Unknown')
+
+    return f"""<div class="news-card-content">
+<div style="display: flex; flex-wrap: wrap; gap: 6px; align-items: center; margin-bottom: 12px;">
+    {badge_html}
+    {thread_html}
+    {topics_html}
+</div>
+<div class="card-summary">{summary_label}{summary_html}</div>
+<div class="analysis-box">
+<div class="analysis-header">
+<span>⚡ Impact Analysis</span>
+</div>
+<div class="analysis-content">
+{impact_reason_escaped}
+</div>
+</div>
+<div style="display: flex; justify-content: space-between; align-items: center; margin-top: 12px;">
+    {link_html}
+    <span style="color: #666; font-size: 0.7rem;">📅 {date_str}</span>
+</div>
+</div>"""
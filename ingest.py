@@ -10,8 +10,15 @@ import re
 import subprocess
 import sys
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from logging.handlers import RotatingFileHandler
 from tavily import TavilyClient
+import memprof
+import schemas
+import snapshot
+import stories
+from schemas import ArticleAnalysis, DeltaAnalysis, ImpactAnalysis
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -52,6 +59,13 @@ def init_db():
                  (id INTEGER PRIMARY KEY, article_link TEXT, persona TEXT,
                   impact_score INTEGER, impact_reason TEXT,
                   UNIQUE(article_link, persona))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS search_cache
+                 (query TEXT PRIMARY KEY, fetched_at REAL, results TEXT)''')
+
+    # Every search topic that found the article (older databases lack the column)
+    columns = {row[1] for row in c.execute("PRAGMA table_info(articles)")}
+    if "search_topics" not in columns:
+        c.execute("ALTER TABLE articles ADD COLUMN search_topics TEXT")
     
     # Create indexes for better query performance
     c.execute('CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date)')
@@ -59,39 +73,141 @@ def init_db():
     c.execute('CREATE INDEX IF NOT EXISTS idx_impacts_persona ON article_impacts(persona)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_impacts_score ON article_impacts(impact_score)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_impacts_link ON article_impacts(article_link)')
+
+    # Story threads (+ thread columns on older databases)
+    stories.init_tables(c)
     
     conn.commit()
     logger.debug("Database initialized with indexes")
     return conn
 
 # ==========================================
-# 3. SCRAPER (Waterfall)
+# 3. NEWS SEARCH (Tavily, concurrent + cached)
 # ==========================================
+def search_params(topic):
+    """Tavily search arguments for a topic (also the cache key, so changing them misses the cache)."""
+    return {"query": topic, "topic": "news", "days": 1, "max_results": config.SEARCH_MAX_RESULTS}
+
+def search_cache_key(topic):
+    return json.dumps(search_params(topic), sort_keys=True)
+
+def get_cached_search(c, topic):
+    """Cached Tavily results for a topic, or None if missing/older than SEARCH_CACHE_TTL."""
+    c.execute("SELECT fetched_at, results FROM search_cache WHERE query = ?", (search_cache_key(topic),))
+    row = c.fetchone()
+    if row and time.time() - row[0] < config.SEARCH_CACHE_TTL:
+        return json.loads(row[1])
+    return None
+
+def search_topics(c, tavily, topics):
+    """
+    Runs all topic searches up front: cache hits cost nothing, misses are
+    issued concurrently. Returns {topic: [results]}.
+    """
+    results = {}
+    pending = []
+    for topic in topics:
+        cached = get_cached_search(c, topic)
+        if cached is not None:
+            logger.info(f"🔍 {topic}... (cached)")
+            results[topic] = cached
+        else:
+            pending.append(topic)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(config.SEARCH_WORKERS, len(pending))) as pool:
+            futures = {
+                pool.submit(tavily.search, **search_params(topic)): topic
+                for topic in pending
+            }
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    res = future.result()
+                except Exception as e:
+                    logger.warning(f"Tavily search failed for '{topic}': {e}")
+                    continue
+                logger.info(f"🔍 {topic}...")
+                results[topic] = res.get('results', [])
+                c.execute("INSERT OR REPLACE INTO search_cache (query, fetched_at, results) VALUES (?,?,?)",
+                          (search_cache_key(topic), time.time(), json.dumps(results[topic])))
+
+    # Expired entries are never read again
+    c.execute("DELETE FROM search_cache WHERE fetched_at < ?", (time.time() - config.SEARCH_CACHE_TTL,))
+    c.connection.commit()
+    return results
+
+def merge_results(results, topics):
+    """
+    Dedupes results by URL into one candidate list (in topic order).
+    Each candidate carries every topic that found it in `topics`.
+    """
+    candidates = {}
+    for topic in topics:
+        for r in results.get(topic, []):
+            url = r['url']
+            if url not in candidates:
+                candidates[url] = dict(r, topics=[])
+            elif len(r.get('content') or '') > len(candidates[url].get('content') or ''):
+                candidates[url]['content'] = r['content']
+            if topic not in candidates[url]['topics']:
+                candidates[url]['topics'].append(topic)
+    return list(candidates.values())
+
+# ==========================================
+# 4. SCRAPER (Waterfall)
+# ==========================================
+def fetch_capped(url, limit=None, timeout=10):
+    """
+    Streams a response body and stops reading at `limit` bytes
+    (MAX_DOWNLOAD_BYTES), so a huge page never lands in memory whole.
+    Returns the (possibly truncated) body as bytes, or None.
+    """
+    limit = limit or config.MAX_DOWNLOAD_BYTES
+    with requests.get(url, timeout=timeout, stream=True) as r:
+        if r.status_code != 200:
+            return None
+
+        buf = bytearray()
+        for chunk in r.iter_content(chunk_size=64 * 1024):
+            buf += chunk[:limit - len(buf)]
+            if len(buf) >= limit:
+                logger.debug(f"Download capped at {limit} bytes: {url}")
+                break
+    return bytes(buf)
+
 def get_content(url, fallback):
     # 1. Try Jina
     try:
-        r = requests.get(f"https://r.jina.ai/{url}", timeout=10)
-        if r.status_code == 200 and len(r.text) > 500:
-            return r.text
+        body = fetch_capped(f"{config.JINA_READER_URL}{url}")
+        if body and len(body) > 500:
+            # At most 4 bytes per char, so never decode more than the text we keep
+            return body[:config.MAX_EXTRACT_CHARS * 4].decode("utf-8", errors="replace")[:config.MAX_EXTRACT_CHARS]
     except:
         pass
 
-    # 2. Try Local
+    # 2. Try Local (trafilatura parses the capped bytes and detects the encoding itself)
     try:
-        d = trafilatura.fetch_url(url)
+        d = fetch_capped(url)
         if d:
             t = trafilatura.extract(d)
-            if t and len(t) > 500: return t
+            if t and len(t) > 500: return t[:config.MAX_EXTRACT_CHARS]
     except:
         pass
 
-    return fallback
+    return fallback[:config.MAX_EXTRACT_CHARS]
 
 # ==========================================
-# 4. AI ANALYSIS (Text Mode)
+# 5. AI ANALYSIS
 # ==========================================
-def query_model(system, user):
-    """Query Ollama API with system + user prompts"""
+# Per-task counters, logged at end of run:
+#   attempts = answers asked for (repairs not included), calls = responses received,
+#   errors = transport failures (timeout, Ollama down), tokens = generated tokens
+LLM_STATS = defaultdict(lambda: {"attempts": 0, "calls": 0, "errors": 0, "tokens": 0,
+                                 "parse_failures": 0, "repairs": 0, "failed": 0})
+
+def query_model(system, user, task="text", fmt=None, num_predict=None):
+    """Query Ollama API with system + user prompts. Returns None if the request itself failed."""
     # Combine system and user into single prompt for Ollama
     full_prompt = f"{system}\n\n{user}"
     
@@ -101,30 +217,125 @@ def query_model(system, user):
         "stream": False,
         "options": {
             "temperature": 0.1,
-            "num_predict": 600
+            "num_predict": num_predict or config.NUM_PREDICT.get(task, 600)
         }
     }
+    # JSON schema -> Ollama constrains decoding to match it
+    if fmt is not None:
+        payload["format"] = fmt
     
     try:
         r = requests.post(config.OLLAMA_URL, json=payload, timeout=60)
         r.raise_for_status()
         response = r.json()
+        LLM_STATS[task]["calls"] += 1
+        LLM_STATS[task]["tokens"] += response.get('eval_count', 0)
         return response.get('response', '')
     except requests.exceptions.Timeout:
         logger.error(f"Ollama API timeout after 60s")
-        return ""
     except requests.exceptions.RequestException as e:
         logger.error(f"Ollama API request failed: {e}")
-        return ""
     except Exception as e:
         logger.error(f"Unexpected error in query_model: {e}", exc_info=True)
-        return ""
+
+    LLM_STATS[task]["errors"] += 1
+    return None
+
+def query_structured(system, user, task, schema, validators, required=None):
+    """
+    Asks for JSON matching `schema` and validates it field by field.
+
+    Invalid or missing fields are re-requested on their own (up to
+    MAX_REPAIR_ATTEMPTS) instead of discarding the whole answer.
+    Returns (clean values, fields that are still invalid).
+    A transport failure is not a parse failure: nothing is repaired then,
+    since a repair would only wait on the same dead server.
+    required: fields the answer is useless without (default: all). Only
+    these count as `failed`; a missing optional field just falls back.
+    """
+    stats = LLM_STATS[task]
+    stats["attempts"] += 1
+    output = query_model(system, user, task, fmt=schema)
+    if output is None:
+        return {}, list(validators)
+
+    clean, invalid = schemas.validate(schemas.parse_json(output), validators)
+    if invalid:
+        stats["parse_failures"] += 1
+        logger.debug(f"{task}: invalid fields {invalid} in {output[:200]!r}")
+
+    for _ in range(config.MAX_REPAIR_ATTEMPTS):
+        if not invalid:
+            break
+        stats["repairs"] += 1
+        repair_user = f"""{user}
+
+Your previous answer was:
+{output[:500]}
+
+It had missing or invalid values for: {', '.join(invalid)}.
+Respond with JSON containing only these fields.
+        """
+        output = query_model(system, repair_user, task,
+                             fmt=schemas.sub_schema(schema, invalid),
+                             num_predict=config.NUM_PREDICT["repair"])
+        if output is None:
+            break
+        fixed, invalid = schemas.validate(schemas.parse_json(output),
+                                          {f: validators[f] for f in invalid})
+        clean.update(fixed)
+
+    required = validators if required is None else required
+    if any(f in required for f in invalid):
+        stats["failed"] += 1
+        logger.warning(f"    ⚠️ {task}: gave up on fields {invalid}")
+    elif invalid:
+        logger.debug(f"{task}: using defaults for optional fields {invalid}")
+    return clean, invalid
+
+def log_memory_stats(profiler):
+    for stage, s in profiler.stages.items():
+        logger.info(f"🧠 {stage}: peak RSS {s['rss_peak_mb']:.0f} MB, "
+                    f"Python heap {s['py_peak_mb']:.1f} MB ({s['runs']} runs)")
+    peak = profiler.peak_rss_mb()
+    if peak > config.MEMORY_BUDGET_MB:
+        logger.warning(f"🧠 Peak RSS {peak:.0f} MB is over the {config.MEMORY_BUDGET_MB} MB budget")
+
+def log_llm_stats():
+    for task, s in LLM_STATS.items():
+        if not s["attempts"] and not s["errors"]:
+            continue
+        failure_rate = s["parse_failures"] / max(s["attempts"], 1)
+        logger.info(f"📊 {task}: {s['attempts']} attempts, {s['calls']} calls, {s['errors']} errors, "
+                    f"{s['tokens']} tokens ({s['tokens'] / max(s['calls'], 1):.0f}/call), "
+                    f"parse failures {failure_rate:.0%}, repairs {s['repairs']}, failed {s['failed']}")
 
 def analyze_article(text):
-    # Reduced to 4000 chars (~1000 tokens) to fit context window
-    safe_text = text[:4000]
+    # Reduced to PROMPT_CHARS (~1000 tokens) to fit context window
+    safe_text = text[:config.PROMPT_CHARS]
 
     system = "You are a professional news analyst. Provide clear, factual summaries without markdown formatting."
+
+    if config.STRUCTURED_OUTPUT:
+        user = f"""
+Analyze this article and extract key information. Respond in JSON.
+
+- "summary": 3 or 4 key facts, one clear sentence each
+- "topics": 1 to 5 short topic tags
+
+Rules:
+- Use plain text only (no asterisks, no bold, no markdown)
+- Focus on numbers, dates, names, and concrete facts
+
+Article text:
+{safe_text}
+        """
+        clean, invalid = query_structured(system, user, "summary",
+                                          schemas.ARTICLE_SCHEMA, schemas.ARTICLE_FIELDS,
+                                          required=("summary",))
+        return ArticleAnalysis(bullets=clean.get("summary", []),
+                               topics=clean.get("topics", []),
+                               ok="summary" not in invalid)
     
     user = f"""
 Analyze this article and extract key information.
@@ -147,28 +358,62 @@ Article text:
 {safe_text}
     """
     
-    output = query_model(system, user)
+    LLM_STATS["summary"]["attempts"] += 1
+    output = query_model(system, user, "summary", num_predict=config.NUM_PREDICT["text"])
+    if output is None:
+        return ArticleAnalysis(ok=False)
     
-    summary = "No summary available."
+    bullets = []
     topics = []
     
     if "SUMMARY:" in output:
         parts = output.split("TOPICS:")
         summary_part = parts[0].replace("SUMMARY:", "").strip()
-        summary = summary_part
+        bullets = [schemas.clean_text(line) for line in summary_part.split("\n")]
         
         if len(parts) > 1:
             topics_part = parts[1].strip()
             topics = [t.strip() for t in topics_part.split(",")]
+    elif output.strip():
+        bullets = [output.strip()]
     else:
-        summary = output
+        # No repair in free-text mode, so a parse failure is a give-up
+        LLM_STATS["summary"]["parse_failures"] += 1
+        LLM_STATS["summary"]["failed"] += 1
+
+    return ArticleAnalysis(bullets=[b for b in bullets if b], topics=topics, ok=bool(bullets))
 
-    return summary, topics
+def analyze_followup(text, thread):
+    """Asks only for what changed since the thread's last article (structured mode)."""
+    safe_text = text[:config.PROMPT_CHARS]
+
+    system = "You are a professional news analyst tracking an ongoing story. Report only new developments, without markdown formatting."
+
+    user = f"""
+This article is a follow-up to a story you already summarized. Respond in JSON.
+
+- "changes": 1 to 3 facts that are NEW compared to the story so far, one clear sentence each
+- "topics": up to 5 short topic tags
+- "material": true if the new facts could change how much the story matters to a reader, false if it is a rehash
+
+Story so far ({thread.title}, since {thread.first_date}):
+{thread.summary}
+
+New article text:
+{safe_text}
+    """
+    clean, invalid = query_structured(system, user, "delta",
+                                      schemas.DELTA_SCHEMA, schemas.DELTA_FIELDS,
+                                      required=("changes",))
+    return DeltaAnalysis(bullets=clean.get("changes", []),
+                         topics=clean.get("topics", []),
+                         material=clean.get("material", True),
+                         ok="changes" not in invalid)
 
 def analyze_impact(summary, persona_name, persona_desc):
     system = "You are a professional risk analyst providing clear, direct assessments."
-    
-    user = f"""
+
+    context = f"""
 Evaluate how this news affects the following person.
 
 Person: {persona_name}
@@ -183,7 +428,24 @@ Scoring guide:
 5-7 = Professionally/personally relevant, may influence decisions
 8-9 = Direct impact requiring attention
 10 = Critical, life-altering event
-
+"""
+
+    if config.STRUCTURED_OUTPUT:
+        user = context + """
+Respond in JSON:
+- "score": integer 0-10
+- "sentiment": Positive, Negative or Neutral
+- "reason": one clear sentence explaining why this matters to this person, in plain language
+        """
+        clean, invalid = query_structured(system, user, "impact",
+                                          schemas.IMPACT_SCHEMA, schemas.IMPACT_FIELDS,
+                                          required=("score", "reason"))
+        return ImpactAnalysis(score=clean.get("score", 0),
+                              sentiment=clean.get("sentiment", "Neutral"),
+                              reason=clean.get("reason", ""),
+                              ok=not ("score" in invalid or "reason" in invalid))
+    
+    user = context + """
 Provide your analysis in this exact format:
 
 SCORE: [0-10]
@@ -191,101 +453,196 @@ SENTIMENT: [Positive/Negative/Neutral]
 REASON: [One clear sentence explaining why this matters to this person, using plain language with no formatting marks]
     """
     
-    output = query_model(system, user)
+    LLM_STATS["impact"]["attempts"] += 1
+    output = query_model(system, user, "impact", num_predict=config.NUM_PREDICT["text"])
     
     # Defaults
-    score = 0
-    reason = "Analysis failed."
+    result = ImpactAnalysis(ok=False)
+    if output is None:
+        return result
     
     try:
         # Parse Score
         score_match = re.search(r"SCORE:\s*(\d+)", output)
         if score_match:
-            score = int(score_match.group(1))
+            result.score = int(score_match.group(1))
             
         # Parse Sentiment & Reason
-        sentiment = "Neutral"
         sentiment_match = re.search(r"SENTIMENT:\s*(.*)", output)
         if sentiment_match:
-            sentiment = sentiment_match.group(1).strip()
+            result.sentiment = sentiment_match.group(1).strip()
             
         reason_match = re.search(r"REASON:\s*(.*)", output, re.DOTALL)
         if reason_match:
-            raw_reason = reason_match.group(1).strip()
             # Clean up formatting artifacts
-            raw_reason = raw_reason.replace("\n", " ").replace("**", "").replace("*", "").strip()
-            # Remove any remaining markdown or extra spaces
-            raw_reason = re.sub(r'\s+', ' ', raw_reason)
-            reason = f"({sentiment}) {raw_reason}"
+            result.reason = schemas.clean_text(reason_match.group(1))
+            result.ok = bool(result.reason)
             
     except Exception as e:
         print(f"    ⚠️ Parsing Error: {e}")
 
-    return score, reason
+    if not result.ok:
+        LLM_STATS["impact"]["parse_failures"] += 1
+        LLM_STATS["impact"]["failed"] += 1
+    return result
 
 # ==========================================
-# 5. MAIN LOOP
+# 6. MAIN LOOP
 # ==========================================
+def save_impacts(conn, c, url, impact_text, profiler, previous_link=None):
+    """
+    Scores the article for every persona that has no usable score yet.
+
+    A failed analysis is not stored, so the persona is retried next run
+    (see retry_missing_impacts) instead of keeping a permanent 0.
+    previous_link: earlier article of the thread whose scores a rehash can reuse.
+    """
+    c.execute("SELECT persona FROM article_impacts WHERE article_link = ? AND impact_reason != ?",
+              (url, schemas.FAILED_REASON))
+    done = {row[0] for row in c.fetchall()}
+
+    for p_name, p_desc in config.PERSONAS.items():
+        if p_name in done:
+            continue
+
+        previous = None
+        if previous_link:
+            previous = stories.previous_impact(c, previous_link, p_name)
+
+        if previous:
+            # Rehash of a known story: carry the last score over, no model call
+            score, reason = previous
+        else:
+            with profiler.stage("impact"):
+                impact = analyze_impact(impact_text, p_name, p_desc)
+            if not impact.ok:
+                logger.warning(f"    ⚠️ {p_name}: impact analysis failed, will retry next run")
+                continue
+            score, reason = impact.score, impact.display_reason
+
+        # REPLACE: an older database may hold a failed placeholder for this persona
+        c.execute("INSERT OR REPLACE INTO article_impacts (article_link, persona, impact_score, impact_reason) VALUES (?,?,?,?)",
+                  (url, p_name, score, reason))
+
+        if score > 1:
+            logger.info(f"    ✅ {p_name}: {score} (Saved)")
+        else:
+            logger.debug(f"    zzz {p_name}: {score} (Ignored)")
+
+        conn.commit()
+
+def retry_missing_impacts(conn, c, today, profiler):
+    """Re-scores recent articles that lack a usable score for some persona."""
+    since = (datetime.date.fromisoformat(today)
+             - datetime.timedelta(days=config.IMPACT_RETRY_DAYS)).isoformat()
+    personas = list(config.PERSONAS)
+    c.execute('''SELECT a.title, a.link, a.summary, a.date, a.is_update, t.summary
+                 FROM articles a LEFT JOIN story_threads t ON t.id = a.thread_id
+                 WHERE a.date >= ?
+                   AND (SELECT COUNT(*) FROM article_impacts i
+                        WHERE i.article_link = a.link AND i.impact_reason != ?
+                          AND i.persona IN ({})) < ?'''.format(",".join("?" * len(personas))),
+              (since, schemas.FAILED_REASON, *personas, len(personas)))
+
+    for title, link, summary, date, is_update, story in c.fetchall():
+        logger.info(f"  ↻ Re-scoring: {title}")
+        if is_update and story:
+            story = stories.story_before(story, summary, date)
+            impact_text = f"Story so far:\n{story}\n\nLatest update:\n{summary}"
+        else:
+            impact_text = summary
+        save_impacts(conn, c, link, impact_text, profiler)
+
 def run_ingestion():
+    config.require("ingest")
     conn = init_db()
     c = conn.cursor()
     today = datetime.date.today().isoformat()
     tavily = TavilyClient(api_key=config.TAVILY_API_KEY)
+    profiler = memprof.MemoryProfiler(enabled=config.MEMORY_PROFILE)
+    profiler.start()
     
     logger.info(f"🚀 Starting Ingestion (Ollama: {config.OLLAMA_MODEL})")
 
     try:
-        for topic in config.SEARCH_TOPICS:
-            logger.info(f"🔍 {topic}...")
-            try:
-                res = tavily.search(query=topic, topic="news", days=1, max_results=3)
-            except Exception as e:
-                logger.warning(f"Tavily search failed for '{topic}': {e}")
+        if hasattr(config, 'PERSONAS'):
+            retry_missing_impacts(conn, c, today, profiler)
+
+        with profiler.stage("search"):
+            results = search_topics(c, tavily, config.SEARCH_TOPICS)
+        candidates = merge_results(results, config.SEARCH_TOPICS)
+        logger.info(f"📥 {len(candidates)} unique articles from {len(results)} topics")
+
+        for r in candidates:
+            url = r['url']
+            
+            c.execute("SELECT id FROM articles WHERE link = ?", (url,))
+            if c.fetchone():
+                logger.debug(f"Skipping duplicate: {url}")
                 continue
-            for r in res.get('results', []):
-                url = r['url']
-                
-                c.execute("SELECT id FROM articles WHERE link = ?", (url,))
-                if c.fetchone():
-                    logger.debug(f"Skipping duplicate: {url}")
-                    continue
 
-                logger.info(f"  > {r['title']}")
-                
+            logger.info(f"  > {r['title']}")
+            
+            with profiler.stage("fetch"):
                 text = get_content(url, r.get('content', ''))
-                if len(text) < 200:
-                    logger.debug(f"Skipping article (too short): {len(text)} chars")
+            if len(text) < 200:
+                logger.debug(f"Skipping article (too short): {len(text)} chars")
+                continue
+
+            # Follow-up to a recent story? Then only ask what changed.
+            thread = stories.match_thread(c, r['title'], r.get('content', ''), r['topics'], today)
+            delta = None
+            if thread and config.STRUCTURED_OUTPUT:
+                with profiler.stage("analyze"):
+                    delta = analyze_followup(text, thread)
+                if not delta.ok:
+                    delta = None
+
+            if delta:
+                analysis = delta
+                thread_id = thread.id
+                stories.extend_thread(c, thread, delta.summary, r['topics'], url, today)
+                logger.info(f"    🧵 Follow-up to '{thread.title}' ({'material' if delta.material else 'rehash'})")
+                impact_text = f"Story so far:\n{thread.summary}\n\nLatest update:\n{delta.summary}"
+            else:
+                with profiler.stage("analyze"):
+                    analysis = analyze_article(text)
+                if not analysis.ok:
+                    # Nothing stored, so the URL is retried next run instead of
+                    # saving a placeholder and scoring it for every persona
+                    logger.warning(f"    ⚠️ No usable summary, will retry next run: {url}")
                     continue
+                thread_id = stories.start_thread(c, r['title'], analysis.summary, r['topics'], url, today)
+                impact_text = analysis.summary
+            
+            c.execute("INSERT INTO articles (title, link, summary, date, topics, search_topics, thread_id, is_update) VALUES (?,?,?,?,?,?,?,?)",
+                      (r['title'], url, analysis.summary, today, json.dumps(analysis.topics),
+                       json.dumps(r['topics']), thread_id, 1 if delta else 0))
+            conn.commit()
 
-                summary, topics = analyze_article(text)
-                
-                c.execute("INSERT INTO articles (title, link, summary, date, topics) VALUES (?,?,?,?,?)",
-                          (r['title'], url, summary, today, json.dumps(topics)))
-                conn.commit()
-
-                if hasattr(config, 'PERSONAS'):
-                    for p_name, p_desc in config.PERSONAS.items():
-                        score, reason = analyze_impact(summary, p_name, p_desc)
-                        
-                        # LOGIC: We save everything to DB to prevent re-processing,
-                        # BUT we verify it here so you see what's happening.
-                        
-                        c.execute("INSERT INTO article_impacts (article_link, persona, impact_score, impact_reason) VALUES (?,?,?,?)",
-                                  (url, p_name, score, reason))
-                        
-                        if score > 1:
-                            logger.info(f"    ✅ {p_name}: {score} (Saved)")
-                        else:
-                            logger.debug(f"    zzz {p_name}: {score} (Ignored)")
-                            
-                        conn.commit()
+            if hasattr(config, 'PERSONAS'):
+                rehash_of = thread.last_link if delta and not delta.material else None
+                save_impacts(conn, c, url, impact_text, profiler, previous_link=rehash_of)
 
         conn.close()
+        log_llm_stats()
         logger.info("✅ Ingestion Complete")
+
+        # Pre-render static briefings so opening the notification costs ~nothing
+        try:
+            with profiler.stage("snapshot"):
+                snapshot.write_snapshots(today)
+        except Exception as e:
+            logger.warning(f"Snapshot generation failed: {e}")
         
     except Exception as e:
         logger.error(f"❌ CRITICAL FAIL: {e}", exc_info=True)
         raise
 
+    finally:
+        if profiler.enabled:
+            log_memory_stats(profiler)
+        profiler.stop()
+
 if __name__ == "__main__":
     run_ingestion()
\ No newline at end of file
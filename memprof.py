@@ -0,0 +1,87 @@
+import os
+import resource
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# -----------------------------------------------------------------------------
+# Per-stage peak memory for ingest (enable with MEMORY_PROFILE in config.py).
+# Two numbers per stage:
+#   - RSS peak: whole process, sampled by a background thread. This is what the
+#     OOM killer sees and includes lxml/C allocations.
+#   - Python heap peak: from tracemalloc (Python objects only).
+# -----------------------------------------------------------------------------
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def rss_mb():
+    """Current resident set size in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Not Linux: fall back to the lifetime peak (KB on Linux, bytes on macOS)
+        return max_rss_mb()
+
+def max_rss_mb():
+    """Lifetime peak RSS of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+class MemoryProfiler:
+    def __init__(self, enabled=True, interval=0.05):
+        self.enabled = enabled
+        self.interval = interval
+        self.stages = {}  # name -> {"rss_peak_mb", "py_peak_mb", "runs"}
+        self._stage_peak = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not self.enabled or self._thread:
+            return
+        tracemalloc.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="memprof", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        tracemalloc.stop()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            current = rss_mb()
+            with self._lock:
+                self._stage_peak = max(self._stage_peak, current)
+
+    @contextmanager
+    def stage(self, name):
+        """Records the peak RSS / Python heap while the block runs. No-op when disabled."""
+        if not self._thread:
+            yield
+            return
+
+        tracemalloc.reset_peak()
+        with self._lock:
+            self._stage_peak = rss_mb()
+        try:
+            yield
+        finally:
+            _, py_peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                rss_peak = max(self._stage_peak, rss_mb())
+
+            s = self.stages.setdefault(name, {"rss_peak_mb": 0.0, "py_peak_mb": 0.0, "runs": 0})
+            s["rss_peak_mb"] = max(s["rss_peak_mb"], rss_peak)
+            s["py_peak_mb"] = max(s["py_peak_mb"], py_peak / (1024 * 1024))
+            s["runs"] += 1
+
+    def peak_rss_mb(self):
+        """Highest sampled RSS across all stages."""
+        return max((s["rss_peak_mb"] for s in self.stages.values()), default=0.0)
@@ -3,6 +3,7 @@ import socket
 import sqlite3
 import datetime
 import config
+import snapshot
 import logging
 from logging.handlers import RotatingFileHandler
 
@@ -31,6 +32,14 @@ def get_ip():
         s.close()
     return IP
 
+def snapshot_server_up():
+    """True if something is listening on the snapshot port (it binds 0.0.0.0, so localhost works)."""
+    try:
+        with socket.create_connection(('127.0.0.1', config.SNAPSHOT_PORT), timeout=1):
+            return True
+    except OSError:
+        return False
+
 def get_daily_stats():
     """Check the DB for today's news stats per persona."""
     conn = sqlite3.connect(config.DB_NAME)
@@ -61,6 +70,7 @@ def get_daily_stats():
     return total_articles, total_critical, stats
 
 def send_alert():
+    config.require("notify")
     total_articles, total_critical, stats = get_daily_stats()
     
     if total_articles == 0:
@@ -73,7 +83,11 @@ def send_alert():
     else:
         ip = get_ip()
 
-    url = f"http://{ip}:8501"
+    # Link the static snapshot when ingest wrote one and the server is up, otherwise the live dashboard
+    if snapshot.has_snapshot() and snapshot_server_up():
+        url = f"http://{ip}:{config.SNAPSHOT_PORT}/"
+    else:
+        url = f"http://{ip}:8501"
 
     # Build Message
     if total_critical > 0:
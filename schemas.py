@@ -0,0 +1,206 @@
+import re
+import json
+import math
+from dataclasses import dataclass, field
+
+# -----------------------------------------------------------------------------
+# Structured output contracts for the model.
+# Each task has a JSON schema (sent to Ollama as `format`) and a per-field
+# validator that cleans the value or raises ValueError. Validation reports the
+# bad fields by name so the repair prompt only asks for those again.
+# -----------------------------------------------------------------------------
+
+SENTIMENTS = ("Positive", "Negative", "Neutral")
+
+# Placeholder reason; older databases stored it for impacts that could not be scored
+FAILED_REASON = "Analysis failed."
+
+ARTICLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 3,
+            "maxItems": 4
+        },
+        "topics": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 1,
+            "maxItems": 5
+        }
+    },
+    "required": ["summary", "topics"]
+}
+
+IMPACT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "minimum": 0, "maximum": 10},
+        "sentiment": {"type": "string", "enum": list(SENTIMENTS)},
+        "reason": {"type": "string"}
+    },
+    "required": ["score", "sentiment", "reason"]
+}
+
+DELTA_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "changes": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 1,
+            "maxItems": 3
+        },
+        "topics": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        },
+        "material": {"type": "boolean"}
+    },
+    "required": ["changes", "topics", "material"]
+}
+
+# ==========================================
+# 1. RESULT TYPES
+# ==========================================
+@dataclass
+class ArticleAnalysis:
+    bullets: list = field(default_factory=list)
+    topics: list = field(default_factory=list)
+    ok: bool = True
+
+    @property
+    def summary(self):
+        """Bullet text as stored in `articles.summary` (the dashboard splits on newlines)."""
+        if not self.bullets:
+            return "No summary available."
+        return "\n".join(f"- {b}" for b in self.bullets)
+
+@dataclass
+class DeltaAnalysis(ArticleAnalysis):
+    """Follow-up to a story thread: bullets hold only what changed."""
+    material: bool = True
+
+@dataclass
+class ImpactAnalysis:
+    score: int = 0
+    sentiment: str = "Neutral"
+    reason: str = ""
+    ok: bool = True
+
+    @property
+    def display_reason(self):
+        """Reason as stored in `article_impacts.impact_reason`."""
+        if not self.ok or not self.reason:
+            return FAILED_REASON
+        return f"({self.sentiment}) {self.reason}"
+
+# ==========================================
+# 2. FIELD VALIDATORS
+# ==========================================
+def clean_text(value):
+    """Strips markdown artifacts and collapses whitespace."""
+    text = str(value).replace("**", "").replace("*", "")
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.lstrip("-• ").strip()
+
+def check_text(value):
+    if not isinstance(value, str):
+        raise ValueError("expected a string")
+    text = clean_text(value)
+    if not text:
+        raise ValueError("empty")
+    return text
+
+def check_score(value):
+    # bool is an int subclass, and "7" / 7.0 are common model drifts worth accepting
+    if isinstance(value, bool):
+        raise ValueError("expected an integer")
+    number = float(value)
+    # json.loads accepts 1e400 / Infinity / NaN, which int() can't convert
+    if not math.isfinite(number):
+        raise ValueError("not a finite number")
+    score = int(number)
+    if not 0 <= score <= 10:
+        raise ValueError("out of range")
+    return score
+
+def check_sentiment(value):
+    sentiment = str(value).strip().capitalize()
+    if sentiment not in SENTIMENTS:
+        raise ValueError(f"not one of {SENTIMENTS}")
+    return sentiment
+
+def check_bool(value):
+    if isinstance(value, bool):
+        return value
+    if str(value).strip().lower() in ("true", "yes"):
+        return True
+    if str(value).strip().lower() in ("false", "no"):
+        return False
+    raise ValueError("expected a boolean")
+
+def check_list(min_items, max_items):
+    def check(value):
+        if not isinstance(value, list):
+            raise ValueError("expected a list")
+        items = [clean_text(v) for v in value if isinstance(v, str)]
+        items = [i for i in items if i]
+        if len(items) < min_items:
+            raise ValueError(f"expected at least {min_items} items")
+        return items[:max_items]
+    return check
+
+ARTICLE_FIELDS = {
+    "summary": check_list(3, 4),
+    "topics": check_list(1, 5)
+}
+
+DELTA_FIELDS = {
+    "changes": check_list(1, 3),
+    "topics": check_list(0, 5),
+    "material": check_bool
+}
+
+IMPACT_FIELDS = {
+    "score": check_score,
+    "sentiment": check_sentiment,
+    "reason": check_text
+}
+
+# ==========================================
+# 3. VALIDATION
+# ==========================================
+def parse_json(output):
+    """Decodes the model output. Returns {} when it is not a JSON object."""
+    try:
+        data = json.loads(output)
+    except (TypeError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def validate(data, validators):
+    """
+    Runs each field validator.
+
+    Returns (clean values, invalid field names). A missing field counts as invalid.
+    """
+    clean = {}
+    invalid = []
+    for name, check in validators.items():
+        try:
+            clean[name] = check(data[name])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            invalid.append(name)
+    return clean, invalid
+
+def sub_schema(schema, fields):
+    """The same schema restricted to `fields`, used for the repair request."""
+    return {
+        "type": "object",
+        "properties": {f: schema["properties"][f] for f in fields},
+        "required": list(fields)
+    }
@@ -0,0 +1,387 @@
+import os
+import re
+import sys
+import gzip
+import json
+import html
+import shutil
+import hashlib
+import datetime
+import config
+import stories
+import logging
+from logging.handlers import RotatingFileHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from feed import CARD_CSS, load_feed, render_content_html
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(logging.Formatter('%(message)s'))
+logger.addHandler(console_handler)
+
+file_handler = RotatingFileHandler('snapshot.log', maxBytes=5*1024*1024, backupCount=3)
+file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+logger.addHandler(file_handler)
+
+# Layout on disk (one folder per day, everything pre-gzipped):
+#   snapshots/LATEST                  -> "2024-05-01"
+#   snapshots/2024-05-01/index.html.gz
+#   snapshots/2024-05-01/peter.html.gz
+#   snapshots/2024-05-01/peter.json.gz
+#   snapshots/2024-05-01/etags.json   -> {"peter.html": "\"3f2a...\"", ...}
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "etags.json"
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+SLUG_RE = re.compile(r"^[a-z0-9-]+$")
+
+# Extra CSS for the static page (the dashboard gets these from Streamlit)
+PAGE_CSS = """
+<style>
+    body { margin: 0 auto; max-width: 900px; padding: 16px; color: #E0E0E0; }
+    a { color: #4DA6FF; }
+    nav a { margin-right: 12px; font-size: 0.85rem; }
+    h1 { margin-bottom: 0; }
+    .caption { color: #888; font-size: 0.85rem; margin-bottom: 16px; }
+    details { margin-bottom: 10px; border: 1px solid #2E333D; border-radius: 8px; }
+    summary { cursor: pointer; padding: 12px 16px; font-weight: 600; }
+</style>
+"""
+
+# ==========================================
+# 1. RENDERING
+# ==========================================
+def persona_slug(persona_name):
+    """URL/file-safe name for a persona ("Peter" -> "peter")."""
+    return re.sub(r"[^a-z0-9]+", "-", persona_name.lower()).strip("-")
+
+def _page(title, body):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+{CARD_CSS}
+{PAGE_CSS}
+</head>
+<body>
+{body}
+</body>
+</html>"""
+
+def _nav(today):
+    links = "".join(
+        f'<a href="/{today}/{persona_slug(p)}.html">👤 {html.escape(p)}</a>'
+        for p in config.PERSONAS
+    )
+    return f"<nav>{links}</nav>"
+
+def render_persona_page(persona_name, rows, today):
+    """Full standalone HTML page mirroring the dashboard feed."""
+    date_label = datetime.date.fromisoformat(today).strftime('%A, %B %d')
+    parts = [
+        _nav(today),
+        "<h1>☕ Morning Brief</h1>",
+        f'<div class="caption">Date: {date_label}</div>',
+    ]
+
+    if not rows:
+        parts.append(f"<p>Waiting for intelligence for <b>{html.escape(persona_name)}</b>...</p>")
+    else:
+        parts.append(f"<h3>🌍 Daily Intelligence Report: {html.escape(persona_name)}</h3>")
+        parts.append(f"<p>Found <b>{len(rows)}</b> relevant articles based on your profile.</p><hr>")
+
+        for row in rows:
+            # Same icon / expand rules as the dashboard
+            if row['impact_score'] >= 8:
+                icon = "🚨"
+            elif row['impact_score'] >= 5:
+                icon = "🔥"
+            else:
+                icon = "📰"
+
+            label = f"{icon} [{row['impact_score']}/10] {html.escape(str(row['title']))}"
+            is_open = " open" if row['impact_score'] >= 7 else ""
+            parts.append(f"<details{is_open}><summary>{label}</summary>{render_content_html(row)}</details>")
+
+    return _page(f"Jetson Briefing - {persona_name}", "\n".join(parts))
+
+def render_index_page(counts, today):
+    """Landing page linked from the Pushover notification."""
+    date_label = datetime.date.fromisoformat(today).strftime('%A, %B %d')
+    items = "".join(
+        f'<li><a href="/{today}/{persona_slug(p)}.html">{html.escape(p)}</a> ({n} articles)</li>'
+        for p, n in counts.items()
+    )
+    body = f"""<h1>☕ Morning Brief</h1>
+<div class="caption">Date: {date_label}</div>
+<ul>{items}</ul>"""
+    return _page("Jetson Briefing", body)
+
+def build_api_document(persona_name, rows, today):
+    """JSON document for other clients. Topics are decoded to a real list."""
+    articles = []
+    for row in rows:
+        try:
+            topics = json.loads(row['topics']) if row['topics'] else []
+        except (TypeError, ValueError):
+            topics = []
+        articles.append({
+            "title": row['title'],
+            "link": row['link'],
+            "summary": row['summary'],
+            "topics": topics,
+            "date": row['date'],
+            "impact_score": row['impact_score'],
+            "impact_reason": row['impact_reason'],
+            "thread": {
+                "id": row.get('thread_id'),
+                "title": row.get('thread_title'),
+                "since": row.get('thread_since'),
+                "story_so_far": (stories.story_before(row.get('thread_summary'), row['summary'], row['date'])
+                                 if row.get('is_update') else None),
+                "is_update": bool(row.get('is_update')),
+                "folded": row.get('folded', 0),
+            },
+        })
+
+    return {
+        "persona": persona_name,
+        "date": today,
+        "articles": articles,
+    }
+
+# ==========================================
+# 2. WRITING
+# ==========================================
+def make_etag(body):
+    """
+    Strong ETag from the uncompressed body, so unchanged pages revalidate with a 304.
+    Pages carry no timestamps, so a rerun with the same articles keeps the same tag.
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+def _write_gz(path, body):
+    """Atomically writes a gzip file. mtime=0 keeps output byte-identical for identical input."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(gzip.compress(body, compresslevel=9, mtime=0))
+    os.replace(tmp, path)
+
+def _write_text(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def prune_snapshots(keep_days=None):
+    """Removes day folders older than SNAPSHOT_KEEP_DAYS."""
+    keep_days = keep_days if keep_days is not None else config.SNAPSHOT_KEEP_DAYS
+    if not os.path.isdir(config.SNAPSHOT_DIR):
+        return
+
+    days = sorted(d for d in os.listdir(config.SNAPSHOT_DIR) if DATE_RE.match(d))
+    if keep_days <= 0 or len(days) <= keep_days:
+        return
+
+    for old in days[:-keep_days]:
+        shutil.rmtree(os.path.join(config.SNAPSHOT_DIR, old), ignore_errors=True)
+        logger.debug(f"Pruned snapshot {old}")
+
+def write_snapshots(today=None):
+    """Pre-renders every persona's briefing (HTML + JSON) for the day."""
+    today = today or datetime.date.today().isoformat()
+    day_dir = os.path.join(config.SNAPSHOT_DIR, today)
+    os.makedirs(day_dir, exist_ok=True)
+
+    etags = {}
+    counts = {}
+
+    for p_name in config.PERSONAS:
+        slug = persona_slug(p_name)
+        rows = load_feed(p_name, today)
+        counts[p_name] = len(rows)
+
+        page = render_persona_page(p_name, rows, today).encode("utf-8")
+        _write_gz(os.path.join(day_dir, f"{slug}.html.gz"), page)
+        etags[f"{slug}.html"] = make_etag(page)
+
+        doc = json.dumps(build_api_document(p_name, rows, today), ensure_ascii=False).encode("utf-8")
+        _write_gz(os.path.join(day_dir, f"{slug}.json.gz"), doc)
+        etags[f"{slug}.json"] = make_etag(doc)
+
+    index = render_index_page(counts, today).encode("utf-8")
+    _write_gz(os.path.join(day_dir, "index.html.gz"), index)
+    etags["index.html"] = make_etag(index)
+
+    # Manifest + pointer last, so the server never sees a half-written day
+    _write_text(os.path.join(day_dir, MANIFEST_FILE), json.dumps(etags, indent=2))
+    _write_text(os.path.join(config.SNAPSHOT_DIR, LATEST_FILE), today)
+
+    prune_snapshots()
+    logger.info(f"📸 Snapshots written for {today} ({len(counts)} personas)")
+    return etags
+
+def has_snapshot(today=None):
+    today = today or datetime.date.today().isoformat()
+    return os.path.exists(os.path.join(config.SNAPSHOT_DIR, today, MANIFEST_FILE))
+
+def latest_snapshot_date():
+    try:
+        with open(os.path.join(config.SNAPSHOT_DIR, LATEST_FILE)) as f:
+            day = f.read().strip()
+    except OSError:
+        return None
+    return day if DATE_RE.match(day) else None
+
+# ==========================================
+# 3. STATIC SERVER
+# ==========================================
+def resolve_path(path):
+    """
+    Maps a request path to (day, file name, immutable).
+
+    /                       -> latest index.html
+    /peter                  -> latest peter.html
+    /api/peter.json         -> latest peter.json
+    /2024-05-01/peter.html  -> that day's file (immutable once the day is over;
+                               today's folder is rewritten by every ingest run)
+    """
+    parts = [p for p in path.split("?", 1)[0].split("/") if p]
+    day = None
+
+    if parts and DATE_RE.match(parts[0]):
+        day = parts.pop(0)
+    elif parts and parts[0] == "api":
+        parts.pop(0)
+
+    immutable = day is not None and day < datetime.date.today().isoformat()
+    day = day or latest_snapshot_date()
+    if day is None or len(parts) > 1:
+        return None
+
+    name = parts[0] if parts else "index.html"
+    if "." not in name:
+        name += ".html"
+
+    stem, ext = name.rsplit(".", 1)
+    if ext not in ("html", "json") or not SLUG_RE.match(stem):
+        return None
+    return day, name, immutable
+
+def encoding_etag(etag, gzipped):
+    """The gzip body is a different representation, so it gets its own strong ETag."""
+    return etag[:-1] + '-gzip"' if gzipped else etag
+
+def etag_matches(header, etag):
+    """If-None-Match check: a comma-separated list or "*", compared weakly (W/ ignored)."""
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def accepts_gzip(header):
+    """Reads Accept-Encoding q-values: "gzip;q=0" refuses gzip, "*" covers it unless gzip is listed."""
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+
+    q = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return q > 0
+
+class SnapshotHandler(BaseHTTPRequestHandler):
+    server_version = "JetsonSnapshot/1.0"
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        resolved = resolve_path(self.path)
+        if resolved is None:
+            self.send_error(404)
+            return
+        day, name, immutable = resolved
+
+        day_dir = os.path.join(config.SNAPSHOT_DIR, day)
+        try:
+            with open(os.path.join(day_dir, MANIFEST_FILE)) as f:
+                etag = json.load(f).get(name)
+            with open(os.path.join(day_dir, name + ".gz"), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            self.send_error(404)
+            return
+
+        gzipped = accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        if etag:
+            etag = encoding_etag(etag, gzipped)
+
+        if etag and etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(304)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        content_type = "application/json" if name.endswith(".json") else "text/html"
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Vary", "Accept-Encoding")
+        if etag:
+            self.send_header("ETag", etag)
+        if immutable:
+            self.send_header("Cache-Control", "public, max-age=86400, immutable")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            body = gzip.decompress(body)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def serve(port=None):
+    port = port or config.SNAPSHOT_PORT
+    httpd = ThreadingHTTPServer(("0.0.0.0", port), SnapshotHandler)
+    logger.info(f"🌐 Serving snapshots from {config.SNAPSHOT_DIR}/ on port {port}")
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve()
+    else:
+        write_snapshots()
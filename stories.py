@@ -0,0 +1,201 @@
+import re
+import json
+import math
+import datetime
+import config
+import schemas
+from collections import Counter
+from dataclasses import dataclass, field
+
+# -----------------------------------------------------------------------------
+# Story threading.
+# Every article belongs to a thread. A new article is matched against threads
+# seen in the last THREAD_LOOKBACK_DAYS using its title + Tavily snippet (text
+# similarity) and the search topics that found it (topic overlap). Matches are
+# follow-ups: ingest only asks the model what changed since the thread's last
+# article instead of summarizing and re-scoring from scratch.
+# The thread summary is the story so far: the first article's bullets plus
+# each follow-up's bullets, dated ("- (2024-05-01) ..."), newest last.
+# -----------------------------------------------------------------------------
+
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "were",
+    "has", "have", "had", "its", "into", "over", "after", "about", "says", "said",
+    "will", "would", "could", "new", "today", "news", "more", "than", "but", "not",
+    "you", "your", "their", "they", "his", "her", "who", "what", "when", "how",
+    "why", "all", "out", "amid"
+}
+
+UPDATE_RE = re.compile(r"^- \((\d{4}-\d{2}-\d{2})\) (.*)$")
+
+@dataclass
+class Thread:
+    id: int
+    title: str
+    summary: str
+    last_delta: str
+    last_link: str
+    topics: list = field(default_factory=list)
+    first_date: str = ""
+    last_date: str = ""
+    article_count: int = 1
+
+# ==========================================
+# 1. DATABASE
+# ==========================================
+def init_tables(c):
+    """Creates the thread table and adds thread columns to older `articles` tables."""
+    c.execute('''CREATE TABLE IF NOT EXISTS story_threads
+                 (id INTEGER PRIMARY KEY, title TEXT, summary TEXT, last_delta TEXT,
+                  last_link TEXT, search_topics TEXT, first_date TEXT, last_date TEXT,
+                  article_count INTEGER DEFAULT 1)''')
+
+    columns = {row[1] for row in c.execute("PRAGMA table_info(articles)")}
+    if "thread_id" not in columns:
+        c.execute("ALTER TABLE articles ADD COLUMN thread_id INTEGER")
+    if "is_update" not in columns:
+        c.execute("ALTER TABLE articles ADD COLUMN is_update INTEGER DEFAULT 0")
+
+    c.execute('CREATE INDEX IF NOT EXISTS idx_threads_last_date ON story_threads(last_date)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_articles_thread ON articles(thread_id)')
+
+def recent_threads(c, today):
+    since = (datetime.date.fromisoformat(today)
+             - datetime.timedelta(days=config.THREAD_LOOKBACK_DAYS)).isoformat()
+    c.execute('''SELECT id, title, summary, last_delta, last_link, search_topics,
+                        first_date, last_date, article_count
+                 FROM story_threads WHERE last_date >= ?''', (since,))
+
+    threads = []
+    for row in c.fetchall():
+        threads.append(Thread(id=row[0], title=row[1], summary=row[2] or "",
+                              last_delta=row[3] or "", last_link=row[4],
+                              topics=json.loads(row[5] or "[]"), first_date=row[6],
+                              last_date=row[7], article_count=row[8]))
+    return threads
+
+def start_thread(c, title, summary, topics, link, today):
+    c.execute('''INSERT INTO story_threads
+                 (title, summary, last_delta, last_link, search_topics, first_date, last_date, article_count)
+                 VALUES (?,?,?,?,?,?,?,1)''',
+              (title, summary, "", link, json.dumps(sorted(set(topics))), today, today))
+    return c.lastrowid
+
+def extend_thread(c, thread, delta, topics, link, today):
+    """Records a follow-up and folds its bullets into the thread's story so far."""
+    merged = sorted(set(thread.topics) | set(topics))
+    c.execute('''UPDATE story_threads
+                 SET summary = ?, last_delta = ?, last_link = ?, search_topics = ?, last_date = ?,
+                     article_count = article_count + 1
+                 WHERE id = ?''',
+              (fold_update(thread.summary, delta, today), delta, link, json.dumps(merged),
+               today, thread.id))
+
+def previous_impact(c, link, persona):
+    """
+    (score, reason) stored for an earlier article in the thread, or None.
+    Failed placeholders from older runs are not real scores and are not carried over.
+    """
+    c.execute("SELECT impact_score, impact_reason FROM article_impacts WHERE article_link = ? AND persona = ? AND impact_reason != ?",
+              (link, persona, schemas.FAILED_REASON))
+    return c.fetchone()
+
+# ==========================================
+# 2. STORY SO FAR
+# ==========================================
+def _bullet(line):
+    line = line.strip()
+    return line[2:].strip() if line.startswith("- ") else line
+
+def fold_update(summary, delta, today):
+    """
+    Appends a follow-up's bullets to the story so far, dated.
+    The original summary is always kept; only the newest THREAD_MAX_UPDATES
+    update bullets are, so the prompt stays small on long-running stories.
+    """
+    lines = [line for line in (summary or "").split("\n") if line.strip()]
+    base = [line for line in lines if not UPDATE_RE.match(line)]
+    updates = [line for line in lines if UPDATE_RE.match(line)]
+    updates += [f"- ({today}) {_bullet(line)}" for line in delta.split("\n") if _bullet(line)]
+    return "\n".join(base + updates[-config.THREAD_MAX_UPDATES:])
+
+def story_before(summary, update, date):
+    """
+    The story so far as it stood before an update: drops the update's own
+    bullets and anything added after its date, which the card shows separately.
+    """
+    own = {_bullet(line) for line in (update or "").split("\n")}
+    kept = []
+    for line in (summary or "").split("\n"):
+        m = UPDATE_RE.match(line.strip())
+        if m and (m.group(1) > date or m.group(2) in own):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+# ==========================================
+# 3. MATCHING
+# ==========================================
+def tokenize(text):
+    words = re.findall(r"[a-z0-9][a-z0-9'.-]*[a-z0-9]|[a-z0-9]", text.lower())
+    return [w for w in words if len(w) > 2 and w not in STOPWORDS]
+
+def cosine(a, b):
+    if not a or not b:
+        return 0.0
+    dot = sum(n * b[w] for w, n in a.items() if w in b)
+    norm = math.sqrt(sum(n * n for n in a.values())) * math.sqrt(sum(n * n for n in b.values()))
+    return dot / norm
+
+def jaccard(a, b):
+    a, b = set(a), set(b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def thread_tokens(thread):
+    # Title counted twice: headlines carry most of the story identity
+    return Counter(tokenize(f"{thread.title} {thread.title} {thread.summary} {thread.last_delta}"))
+
+def similarity(tokens, topics, thread):
+    text_score = cosine(tokens, thread_tokens(thread))
+    # Search topics are a few broad queries, so a shared topic alone says little.
+    # It may only tip over the line a match the text already nearly makes.
+    if not topics or not thread.topics or text_score < config.THREAD_MIN_TEXT_SIMILARITY:
+        return text_score
+    w = config.THREAD_TOPIC_WEIGHT
+    return (1 - w) * text_score + w * jaccard(topics, thread.topics)
+
+def match_thread(c, title, snippet, topics, today):
+    """Best recent thread for an incoming article, or None if nothing clears THREAD_SIMILARITY."""
+    tokens = Counter(tokenize(f"{title} {title} {snippet}"))
+    best, best_score = None, config.THREAD_SIMILARITY
+
+    for thread in recent_threads(c, today):
+        score = similarity(tokens, topics, thread)
+        if score >= best_score:
+            best, best_score = thread, score
+
+    return best
+
+# ==========================================
+# 4. FEED GROUPING
+# ==========================================
+def group_threads(rows):
+    """
+    One card per thread: keeps the newest article (its delta) and records
+    how many other articles of the same thread were folded into it.
+    """
+    groups = {}
+    for row in rows:
+        key = ("thread", row['thread_id']) if row.get('thread_id') else ("link", row['link'])
+        groups.setdefault(key, []).append(row)
+
+    cards = []
+    for members in groups.values():
+        card = max(members, key=lambda r: r.get('id') or 0)
+        card['folded'] = len(members) - 1
+        cards.append(card)
+
+    cards.sort(key=lambda r: r['impact_score'], reverse=True)
+    return cards